@@ -0,0 +1,232 @@
+"""
+Risk engine for equity analysis.
+
+Keeps an exponentially weighted (RiskMetrics-style, zero-mean) covariance of
+daily returns across a fixed universe in a numpy array and updates it
+incrementally with each new bar as a rank-one update:
+
+    S <- lam * S + (1 - lam) * r r^T
+
+Per bar only O(N) vector work is done: the return vector is appended to a
+small buffer, and buffered bars are folded into S as one rank-k update
+(a single matrix product) every `flush_every` bars or when the matrix is read.
+The result is identical to applying the rank-one updates bar by bar.
+
+Volatility, beta to the index and drawdown come from per-ticker vectors. They
+are bias-corrected EWMAs (weighted sum / sum of weights) over the bars where
+the ticker actually had a return, so a late listing or a bar where a ticker is
+missing does not pull its volatility or beta toward zero. Correlation clusters
+come from the full matrix; a missing ticker enters S with a zero return, and
+correlations are normalized by S's own diagonal so those gaps largely cancel.
+"""
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from src.types import RiskRating, RiskSummary
+
+TRADING_DAYS = 252
+
+
+class RiskEngine:
+    """Incremental EWMA risk model mapping volatility, beta and drawdown to `risk_rating`.
+
+    Usage:
+        engine = RiskEngine(tickers)
+        for bar in bars:                      # oldest -> newest
+            engine.update(bar.closes, bar.index_close)
+        engine.analyze({"ticker": "AAPL"})    # -> RiskSummary
+        engine.analyze({"ticker": "AAPL"}, include_cluster=True)
+
+    Cost: the covariance matrix is a float64 N x N array (~72 MB at 3k
+    tickers, ~800 MB at 10k); each flush is one O(k * N^2) matrix product.
+    Pass `track_covariance=False` to keep only the O(N) per-ticker vectors
+    when correlation clusters are not needed.
+    """
+
+    def __init__(
+        self,
+        tickers: Sequence[str],
+        lam: float = 0.94,
+        track_covariance: bool = True,
+        min_bars: int = 20,
+        cluster_threshold: float = 0.7,
+        flush_every: int = 64,
+    ) -> None:
+        self.tickers = list(tickers)
+        self._index = {t: i for i, t in enumerate(self.tickers)}
+        self.lam = lam
+        self.track_covariance = track_covariance
+        self.min_bars = min_bars
+        self.cluster_threshold = cluster_threshold
+        self.flush_every = flush_every
+
+        n = len(self.tickers)
+        self._last = np.full(n, np.nan)
+        self._bars = np.zeros(n, dtype=np.int64)  # returns folded in, per ticker
+        # Bias-corrected EWMAs: estimate = num / den, both decayed only on bars the ticker traded.
+        self._weight = np.zeros(n)
+        self._var_num = np.zeros(n)
+        self._cov_index_num = np.zeros(n)
+        self._index_var_num = np.zeros(n)  # index variance over the same bars, for beta
+        self._peak = np.zeros(n)
+        self._drawdown = np.zeros(n)
+        self._max_drawdown = np.zeros(n)
+        self._index_last: Optional[float] = None
+
+        self._cov = np.zeros((n, n)) if track_covariance else None
+        self._pending = np.zeros((flush_every, n)) if track_covariance else None
+        self._n_pending = 0
+        self._clusters: Optional[Dict[str, int]] = None
+
+    # ----- Incremental update -----
+
+    def update(self, closes: Union[Mapping[str, float], Sequence[float], np.ndarray], index_close: float) -> None:
+        """Fold one bar of closes into the model.
+
+        `closes` is either a ticker -> close mapping or an array aligned with
+        `tickers` (NaN for missing). A ticker contributes a return only when it
+        has both a valid close on this bar and a previous close; otherwise its
+        estimates are left unchanged. A NaN or non-positive `index_close` is
+        treated as a missing index bar: beta inputs are skipped for this bar
+        and the next one, volatility and drawdown still update.
+        """
+        if isinstance(closes, Mapping):
+            prices = np.array([closes.get(t, np.nan) for t in self.tickers], dtype=float)
+        else:
+            prices = np.asarray(closes, dtype=float)
+        present = np.isfinite(prices) & (prices > 0)
+        index_close = float(index_close) if index_close is not None else np.nan
+        index_ok = bool(np.isfinite(index_close) and index_close > 0)
+
+        valid = present & np.isfinite(self._last)
+        if valid.any():
+            returns = np.zeros(len(self.tickers))
+            np.divide(prices, self._last, out=returns, where=valid)
+            returns[valid] -= 1.0
+
+            lam, w = self.lam, 1.0 - self.lam
+            r = returns[valid]
+            self._weight[valid] = lam * self._weight[valid] + w
+            self._var_num[valid] = lam * self._var_num[valid] + w * r * r
+            if index_ok and self._index_last is not None:
+                index_return = index_close / self._index_last - 1.0
+                self._cov_index_num[valid] = lam * self._cov_index_num[valid] + w * r * index_return
+                self._index_var_num[valid] = lam * self._index_var_num[valid] + w * index_return * index_return
+            self._bars += valid
+
+            if self._pending is not None:
+                self._pending[self._n_pending] = returns
+                self._n_pending += 1
+                self._clusters = None
+                if self._n_pending == self.flush_every:
+                    self._flush()
+
+        self._peak[present] = np.maximum(self._peak[present], prices[present])
+        self._drawdown[present] = prices[present] / self._peak[present] - 1.0
+        np.minimum(self._max_drawdown, self._drawdown, out=self._max_drawdown)
+        self._last[present] = prices[present]
+        self._index_last = index_close if index_ok else None
+
+    def _flush(self) -> None:
+        """Apply the buffered rank-one updates to S as a single rank-k update."""
+        k = self._n_pending
+        if not k:
+            return
+        # Bar t (0 = oldest) ends up weighted by (1 - lam) * lam ** (k - 1 - t).
+        scale = np.sqrt((1.0 - self.lam) * self.lam ** np.arange(k - 1, -1, -1))
+        x = self._pending[:k] * scale[:, None]
+        self._cov *= self.lam ** k
+        self._cov += x.T @ x
+        self._n_pending = 0
+
+    # ----- Derived measures -----
+
+    def _daily_var(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self._weight > 0, self._var_num / self._weight, 0.0)
+
+    def covariance(self, a: str, b: str) -> float:
+        """EWMA covariance of daily returns between two tickers (correlation x both volatilities)."""
+        corr = self.correlation(a, b)
+        if corr is None:
+            return 0.0
+        var = self._daily_var()
+        return corr * float(np.sqrt(var[self._index[a]] * var[self._index[b]]))
+
+    def correlation(self, a: str, b: str) -> Optional[float]:
+        if self._cov is None:
+            raise RuntimeError("Covariance matrix is not tracked (track_covariance=False).")
+        self._flush()
+        i, j = self._index[a], self._index[b]
+        denom = self._cov[i, i] * self._cov[j, j]
+        if denom <= 0:
+            return None
+        return float(self._cov[i, j] / np.sqrt(denom))
+
+    def clusters(self) -> Dict[str, int]:
+        """Group tickers whose return correlation is >= `cluster_threshold` (single linkage)."""
+        if self._cov is None:
+            return {}
+        if self._clusters is not None:
+            return self._clusters
+        self._flush()
+        sd = np.sqrt(np.diag(self._cov))
+        live = sd > 0
+        adjacency = self._cov >= self.cluster_threshold * np.outer(sd, sd)
+        adjacency &= np.outer(live, live)
+
+        labels = np.full(len(self.tickers), -1, dtype=np.int64)
+        next_label = 0
+        for start in range(len(self.tickers)):
+            if labels[start] >= 0:
+                continue
+            labels[start] = next_label
+            frontier = np.zeros(len(self.tickers), dtype=bool)
+            frontier[start] = True
+            while frontier.any():
+                reached = adjacency[frontier].any(axis=0) & (labels < 0)
+                labels[reached] = next_label
+                frontier = reached
+            next_label += 1
+        self._clusters = {t: int(label) for t, label in zip(self.tickers, labels)}
+        return self._clusters
+
+    def analyze(self, data: Optional[Dict[str, Any]], include_cluster: bool = False) -> Optional[RiskSummary]:
+        """Return a `RiskSummary` for `data["ticker"]`.
+
+        Returns None when `data` is falsy, the ticker is unknown, or fewer than
+        `min_bars` of its own returns have been folded in. `cluster` is only
+        filled when `include_cluster` is set, since it needs a pass over the
+        full covariance matrix after each update and `risk_rating` does not use it.
+        """
+        if not data:
+            return None
+        i = self._index.get(data.get("ticker"))
+        if i is None or self._bars[i] < self.min_bars:
+            return None
+
+        volatility = float(np.sqrt(self._var_num[i] / self._weight[i] * TRADING_DAYS))
+        beta = float(self._cov_index_num[i] / self._index_var_num[i]) if self._index_var_num[i] > 0 else None
+        max_drawdown = float(self._max_drawdown[i])
+        return RiskSummary(
+            volatility_ann=volatility,
+            beta=beta,
+            drawdown=float(self._drawdown[i]),
+            max_drawdown=max_drawdown,
+            cluster=self.clusters().get(self.tickers[i]) if include_cluster and self._cov is not None else None,
+            risk_rating=self.rate(volatility, beta, max_drawdown),
+        )
+
+    @staticmethod
+    def rate(volatility: float, beta: Optional[float], max_drawdown: float) -> RiskRating:
+        """Map risk measures to Low/Medium/High.
+
+        High: annualized vol > 45%, beta > 1.5 or max drawdown worse than -50%.
+        Low: vol < 20%, beta (if known) < 0.9 and max drawdown better than -25%.
+        """
+        if volatility > 0.45 or (beta is not None and beta > 1.5) or max_drawdown < -0.5:
+            return "High"
+        if volatility < 0.2 and (beta is None or beta < 0.9) and max_drawdown > -0.25:
+            return "Low"
+        return "Medium"
@@ -1,13 +1,134 @@
 """
 Orchestrator agent for coordinating pipeline modules.
 """
-from typing import Any
+import time
+from typing import Any, Dict, List, Mapping, Optional
+
+from src.engines.fundamentals import FundamentalsEngine
+from src.engines.macro import MacroEngine
+from src.engines.sentiment import SentimentEngine
+from src.engines.technicals import TechnicalsEngine
+from src.orchestrator.profiling import Profiler
+from src.tools.api_fetcher import APIFetcher
+from src.tools.validator import Validator
+
 
 class Orchestrator:
-    """Coordinates agent modules and workflow."""
-    def __init__(self) -> None:
-        pass
+    """Coordinates agent modules and workflow.
+
+    Engines and the fetcher are created once and reused across `run` calls so
+    long-lived callers (e.g. the service in `src.orchestrator.service`) keep
+    them warm between requests. Per-ticker profiling is off unless enabled via
+    `src.orchestrator.profiling` (see `Profiler.from_env`).
+    """
+
+    # Engine name -> APIFetcher endpoint that supplies its raw input.
+    ENDPOINTS: Dict[str, str] = {
+        "fundamentals": "fundamentals",
+        "technicals": "prices",
+        "sentiment": "news",
+        "macro": "macro",
+    }
+
+    def __init__(
+        self,
+        fetcher: Optional[APIFetcher] = None,
+        engines: Optional[Dict[str, Any]] = None,
+        validator: Optional[Validator] = None,
+        profiler: Optional[Profiler] = None,
+    ) -> None:
+        self.profiler = profiler or Profiler.from_env()
+        self.fetcher = fetcher or APIFetcher()
+        self.validator = validator or Validator()
+        self.engines = engines or {
+            "fundamentals": FundamentalsEngine(),
+            "technicals": TechnicalsEngine(),
+            "sentiment": SentimentEngine(),
+            "macro": MacroEngine(),
+        }
 
     def run(self, input_data: Any) -> Any:
-        """Run the pipeline with provided input data."""
-        pass
+        """Run the pipeline with provided input data.
+
+        Expected input:
+        {
+            "ticker": "AAPL",
+            "as_of": "2025-08-11",
+            # optional raw inputs keyed by engine name; missing ones are fetched
+            "fundamentals": {...}, "technicals": {...}, ...
+        }
+
+        Returns None when `input_data` is falsy, otherwise a dict with the
+        ticker, as_of and each engine's output keyed by engine name. Inputs
+        that fail `Validator.check_quality` are not analyzed; the dict then
+        carries `"quarantined": [issue, ...]` instead of engine outputs.
+        """
+        if not input_data:
+            return None
+
+        with self.profiler.session(input_data.get("ticker")) as prof:
+            with prof.stage("fetch"):
+                inputs = self._gather(input_data)
+            with prof.stage("validate"):
+                issues = self.validator.check_quality({inputs["ticker"]: inputs})[inputs["ticker"]]
+            if issues:
+                return {"ticker": inputs["ticker"], "as_of": inputs["as_of"], "quarantined": issues}
+            return self._analyze(inputs, prof)
+
+    def run_batch(self, universe: Mapping[str, Mapping[str, Any]], as_of: Optional[str] = None) -> Dict[str, Any]:
+        """Run the pipeline for many tickers, quarantining those that fail data quality.
+
+        `universe` maps ticker -> the same payload `run` takes (ticker/as_of
+        may be omitted). Missing inputs are fetched for the whole universe
+        first, then `Validator.check_quality` scans it in one pass so bad
+        tickers never reach the engine and LLM stages. A ticker whose fetch
+        raises is quarantined as `["fetch_error"]`; the rest of the batch runs.
+
+        Returns {"results": {ticker: run output}, "quarantined": {ticker: [issue, ...]}}.
+        When profiling is enabled, the batch is profiled as its own run: the
+        bulk scan is recorded as a "__batch__" entry with a single `validate`
+        stage, each profiled ticker's `validate` stage is its share of that
+        scan, and the run's hotspot report is written at the end.
+        """
+        gathered: Dict[str, Dict[str, Any]] = {}
+        quarantined: Dict[str, List[str]] = {}
+        for ticker, payload in universe.items():
+            try:
+                gathered[ticker] = self._gather({"ticker": ticker, "as_of": as_of, **payload})
+            except Exception:
+                quarantined[ticker] = ["fetch_error"]
+        run = self.profiler.start_run() if self.profiler.enabled else None
+        with self.profiler.session("__batch__", always=True, run=run) as prof:
+            start = time.perf_counter()
+            with prof.stage("validate"):
+                issues = self.validator.check_quality(gathered)
+            validate_share = (time.perf_counter() - start) / max(1, len(gathered))
+        quarantined.update((ticker, found) for ticker, found in issues.items() if found)
+        results: Dict[str, Any] = {}
+        for ticker, inputs in gathered.items():
+            if ticker in quarantined:
+                continue
+            with self.profiler.session(ticker, run=run) as prof:
+                prof.add("validate", validate_share)
+                results[ticker] = self._analyze(inputs, prof)
+        if run is not None:
+            self.profiler.write_report(run)
+        return {"results": results, "quarantined": quarantined}
+
+    def _analyze(self, inputs: Mapping[str, Any], prof: Any) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"ticker": inputs["ticker"], "as_of": inputs["as_of"]}
+        for name, engine in self.engines.items():
+            with prof.stage(name):
+                result[name] = engine.analyze(inputs.get(name))
+        return result
+
+    def _gather(self, input_data: Mapping[str, Any]) -> Dict[str, Any]:
+        """Return `input_data` with every engine input present, fetching missing ones."""
+        inputs = dict(input_data)
+        params = {"ticker": inputs.get("ticker"), "as_of": inputs.get("as_of")}
+        for name in self.engines:
+            if inputs.get(name) is None:
+                inputs[name] = self.fetcher.fetch(self.ENDPOINTS.get(name, name), params)
+        inputs.setdefault("ticker", None)
+        inputs.setdefault("as_of", None)
+        return inputs
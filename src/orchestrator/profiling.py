@@ -0,0 +1,284 @@
+"""
+Opt-in hot-path profiling for the orchestrator and engines.
+
+A `Profiler` decides per ticker whether to capture a cProfile trace:
+  - `sample_rate`: stable fraction of tickers (chosen by a hash of the ticker,
+    so the same tickers are sampled run after run);
+  - `slow_ms`: profile every ticker but keep only traces whose total latency
+    exceeds the threshold (higher overhead; meant for targeted investigation).
+
+Every profiled ticker also records wall time per stage (validation, each
+engine's `analyze`). Traces are written as standard `.prof` files that
+`pstats` can merge, and `write_report` produces a merged profile plus a top-N
+hotspot report for the run.
+
+Sessions record into the profiler's default run unless given their own run
+from `start_run` (e.g. one per `Orchestrator.run_batch`), so a batch report
+never takes or drops records of concurrent on-demand requests. The default
+run is reported automatically once it holds `max_records` records.
+
+Profiling is configured without code changes through a JSON file named by the
+`ALPHALENS_PROFILE_CONFIG` environment variable, e.g.
+
+    {"sample_rate": 0.05, "slow_ms": 750, "output_dir": "/tmp/alphalens-prof", "top_n": 25, "max_records": 5000}
+
+The file is re-read when it changes, so long-running services pick up new
+settings (or `{}` to switch profiling off) without a restart.
+"""
+import cProfile
+import io
+import itertools
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import zlib
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+CONFIG_ENV = "ALPHALENS_PROFILE_CONFIG"
+
+
+class ProfileRun:
+    """One report's worth of records; its `.prof` files share a run directory."""
+
+    def __init__(self, run_id: str) -> None:
+        self.run_id = run_id
+        self.records: List[Dict[str, Any]] = []
+        self.dir: Optional[str] = None  # fixed on first write
+
+
+class _Session:
+    """Per-ticker profiling state; `stage` times a named section."""
+
+    def __init__(self, ticker: str) -> None:
+        self.ticker = ticker
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Attribute time measured elsewhere (e.g. a share of a batch-wide stage)."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+
+class _NullSession:
+    """Session used when profiling is off; adds no timing overhead."""
+
+    def stage(self, name: str) -> ContextManager[None]:
+        return nullcontext()
+
+    def add(self, name: str, seconds: float) -> None:
+        pass
+
+
+_NULL_SESSION = _NullSession()
+
+
+class Profiler:
+    """Sampled / threshold-triggered per-ticker profiler."""
+
+    def __init__(
+        self,
+        output_dir: str = "profiles",
+        sample_rate: float = 0.0,
+        slow_ms: Optional[float] = None,
+        top_n: int = 20,
+        config_path: Optional[str] = None,
+        max_records: int = 10_000,
+    ) -> None:
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.top_n = top_n
+        self.max_records = max_records
+        self.config_path = config_path
+        self._config_mtime: Optional[float] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._cprofile_busy = False
+        self._seq = itertools.count()
+        self._run = self.start_run()
+
+    @classmethod
+    def from_env(cls) -> "Profiler":
+        """Build a profiler driven by the `ALPHALENS_PROFILE_CONFIG` file, if set."""
+        profiler = cls(config_path=os.environ.get(CONFIG_ENV) or None)
+        profiler.reload()
+        return profiler
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or self.slow_ms is not None
+
+    def reload(self, force: bool = True) -> None:
+        """Re-read the config file if it changed (checked at most once a second unless forced)."""
+        if not self.config_path:
+            return
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return
+        self._next_check = now + 1.0
+        try:
+            mtime = os.path.getmtime(self.config_path)
+        except OSError:
+            mtime = None
+        if mtime == self._config_mtime:
+            return
+        self._config_mtime = mtime
+        config: Dict[str, Any] = {}
+        if mtime is not None:
+            try:
+                with open(self.config_path, encoding="utf-8") as fh:
+                    config = json.load(fh) or {}
+            except (OSError, ValueError):
+                return  # keep the previous settings on a half-written / bad file
+        try:
+            sample_rate = float(config.get("sample_rate", 0.0))
+            slow_ms = config.get("slow_ms")
+            slow_ms = float(slow_ms) if slow_ms is not None else None
+            top_n = int(config.get("top_n", self.top_n))
+            max_records = int(config.get("max_records", self.max_records))
+        except (TypeError, ValueError):
+            return  # keep the previous settings on malformed values
+        self.sample_rate, self.slow_ms, self.top_n, self.max_records = sample_rate, slow_ms, top_n, max_records
+        self.output_dir = config.get("output_dir", self.output_dir)
+
+    def start_run(self) -> ProfileRun:
+        """Open a separate run (own id, records and directory), e.g. for one batch.
+
+        Pass it to `session(..., run=...)` and `write_report(run)`; the
+        default run used by other sessions is left untouched.
+        """
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        return ProfileRun(f"{stamp}-{next(self._seq)}")
+
+    @property
+    def run_id(self) -> str:
+        return self._run.run_id
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """Records of the default run."""
+        return self._run.records
+
+    @property
+    def run_dir(self) -> str:
+        return self._dir_for(self._run)
+
+    def _dir_for(self, run: ProfileRun) -> str:
+        if run.dir is None:
+            run.dir = os.path.join(self.output_dir, f"run-{run.run_id}")
+        return run.dir
+
+    @contextmanager
+    def session(self, ticker: Optional[str], always: bool = False, run: Optional[ProfileRun] = None) -> Iterator[Any]:
+        """Profile one ticker's pipeline run if it is selected; yields an object with `stage(name)`.
+
+        `always=True` profiles the session whenever profiling is enabled,
+        regardless of sampling (used for batch-wide stages). Records go to
+        `run` if given, else to the default run.
+        """
+        self.reload(force=False)
+        # Snapshot settings: a concurrent reload must not change this session's decisions.
+        sample_rate, slow_ms = self.sample_rate, self.slow_ms
+        ticker = ticker or "<unknown>"
+        enabled = sample_rate > 0 or slow_ms is not None
+        sampled = enabled and (always or zlib.crc32(ticker.encode("utf-8")) / 2 ** 32 < sample_rate)
+        if not sampled and slow_ms is None:
+            yield _NULL_SESSION
+            return
+
+        session = _Session(ticker)
+        # cProfile cannot run two profilers at once; concurrent tickers still get stage timings.
+        with self._lock:
+            profile: Optional[cProfile.Profile] = None if self._cprofile_busy else cProfile.Profile()
+            self._cprofile_busy = self._cprofile_busy or profile is not None
+        if profile is not None:
+            try:
+                profile.enable()
+            except ValueError:  # another profiling tool (e.g. a debugger) owns the hook
+                profile = None
+                with self._lock:
+                    self._cprofile_busy = False
+        start = time.perf_counter()
+        try:
+            yield session
+        finally:
+            if profile is not None:
+                profile.disable()
+                with self._lock:
+                    self._cprofile_busy = False
+            total_ms = (time.perf_counter() - start) * 1000
+            if sampled or (slow_ms is not None and total_ms > slow_ms):
+                self._record(session, total_ms, profile, run)
+
+    def _record(
+        self, session: _Session, total_ms: float, profile: Optional[cProfile.Profile], run: Optional[ProfileRun]
+    ) -> None:
+        """Store a session's timings (and trace); I/O errors never fail the profiled ticker."""
+        with self._lock:
+            target = run or self._run
+            run_dir = self._dir_for(target)
+        path = None
+        if profile is not None:
+            # Tickers come from callers (e.g. HTTP query strings): keep them out of the path.
+            safe = re.sub(r"[^A-Za-z0-9_-]", "_", session.ticker)[:64]
+            path = os.path.join(run_dir, f"{next(self._seq):06d}-{safe}.prof")
+            try:
+                os.makedirs(run_dir, exist_ok=True)
+                profile.dump_stats(path)
+            except OSError:
+                path = None
+        with self._lock:
+            target.records.append({
+                "ticker": session.ticker,
+                "total_ms": total_ms,
+                "stages_ms": {k: v * 1000 for k, v in session.stages.items()},
+                "profile": path,
+            })
+            full = target is self._run and len(target.records) >= self.max_records
+            if full:  # bound memory in long-running services: report and start afresh
+                self._run = self.start_run()
+        if full:
+            try:
+                self.write_report(target)
+            except OSError:
+                pass
+
+    def write_report(self, run: Optional[ProfileRun] = None) -> Optional[str]:
+        """Merge a run's profiles and write `hotspots.txt` / `tickers.json`; returns the run dir.
+
+        Without `run`, reports the default run and starts a new default run so
+        long-running callers can report periodically.
+        """
+        with self._lock:
+            if run is None:
+                run, self._run = self._run, self.start_run()
+            records, run_dir = list(run.records), self._dir_for(run)
+        if not records:
+            return None
+        os.makedirs(run_dir, exist_ok=True)
+        paths = [r["profile"] for r in records if r["profile"]]
+        buf = io.StringIO()
+        if paths:
+            stats = pstats.Stats(paths[0], stream=buf)
+            for path in paths[1:]:
+                stats.add(path)
+            stats.dump_stats(os.path.join(run_dir, "merged.prof"))
+            stats.sort_stats("tottime").print_stats(self.top_n)
+        with open(os.path.join(run_dir, "hotspots.txt"), "w", encoding="utf-8") as fh:
+            fh.write(buf.getvalue())
+        slowest = sorted(records, key=lambda r: r["total_ms"], reverse=True)
+        with open(os.path.join(run_dir, "tickers.json"), "w", encoding="utf-8") as fh:
+            json.dump(slowest, fh, indent=2)
+        return run_dir
@@ -0,0 +1,219 @@
+"""
+Local HTTP service mode for on-demand analyses.
+
+Wraps a single long-lived `Orchestrator` so engines and fetcher connections
+stay warm across requests, and adds two layers in front of `Orchestrator.run`:
+
+  - single-flight: concurrent requests for the same (ticker, as_of) share one
+    in-flight computation instead of each triggering a full pipeline run;
+  - an in-memory LRU cache with a TTL for recently computed results.
+
+Run with:  python -m src.orchestrator.service --port 8080
+Then:      GET /analyze?ticker=AAPL&as_of=2025-08-11
+           GET /profiling/report   (flush sampled profiles, see src.orchestrator.profiling)
+"""
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from src.orchestrator.orchestrator import Orchestrator
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire `ttl_seconds` after insertion."""
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 300.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return `(hit, value)`; expired entries are evicted and count as misses."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class _Call:
+    """An in-flight computation that followers wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller for a key runs `fn`; callers arriving while it is running
+    block and receive the same result (or the same exception).
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as exc:  # propagate to every waiter
+                call.error = exc
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+class AnalysisService:
+    """Serve `Orchestrator.run` results with caching and per-ticker single-flight."""
+
+    def __init__(
+        self,
+        orchestrator: Optional[Orchestrator] = None,
+        cache_size: int = 1024,
+        ttl_seconds: float = 300.0,
+    ) -> None:
+        self.orchestrator = orchestrator or Orchestrator()
+        self.cache = TTLCache(maxsize=cache_size, ttl_seconds=ttl_seconds)
+        self._flight = SingleFlight()
+
+    def analyze(self, ticker: str, as_of: Optional[str] = None) -> Any:
+        """Return the analysis for (ticker, as_of), computing it at most once per TTL."""
+        key = (ticker.upper(), as_of or date.today().isoformat())
+        hit, value = self.cache.get(key)
+        if hit:
+            return value
+        return self._flight.do(key, lambda: self._compute(key))
+
+    def _compute(self, key: Tuple[str, str]) -> Any:
+        # A follower of a just-finished flight may arrive here after the
+        # leader populated the cache; re-check before recomputing.
+        hit, value = self.cache.get(key)
+        if hit:
+            return value
+        ticker, as_of = key
+        result = self.orchestrator.run({"ticker": ticker, "as_of": as_of})
+        self.cache.set(key, result)
+        return result
+
+
+def _jsonable(value: Any) -> Any:
+    """Convert Pydantic models (v1/v2) nested in engine outputs into plain JSON types."""
+    dump = getattr(value, "model_dump", None) or getattr(value, "dict", None)
+    if callable(dump) and not isinstance(value, dict):
+        return _jsonable(dump())
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def make_handler(service: AnalysisService) -> type:
+    """Build a request handler class bound to `service`."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            if url.path == "/healthz":
+                self._send(200, {"status": "ok"})
+                return
+            if url.path == "/profiling/report":
+                try:
+                    run_dir = service.orchestrator.profiler.write_report()
+                except Exception as exc:
+                    self._send(500, {"error": str(exc)})
+                    return
+                self._send(200, {"run_dir": run_dir})
+                return
+            if url.path != "/analyze":
+                self._send(404, {"error": "not found"})
+                return
+            query = parse_qs(url.query)
+            ticker = (query.get("ticker") or [""])[0]
+            if not ticker:
+                self._send(400, {"error": "missing 'ticker' parameter"})
+                return
+            as_of = (query.get("as_of") or [None])[0]
+            try:
+                result = service.analyze(ticker, as_of)
+            except Exception as exc:
+                self._send(500, {"error": str(exc)})
+                return
+            self._send(200, _jsonable(result))
+
+        def _send(self, status: int, body: Any) -> None:
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def make_server(service: AnalysisService, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    """Create (but do not start) a threaded HTTP server for `service`."""
+    return ThreadingHTTPServer((host, port), make_handler(service))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve on-demand AlphaLensAI analyses over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--ttl", type=float, default=300.0, help="Seconds a cached result stays fresh.")
+    args = parser.parse_args()
+
+    server = make_server(AnalysisService(cache_size=args.cache_size, ttl_seconds=args.ttl), args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Cached, parallel rendering of `Decision.artifacts`.
+
+Charts are rendered to SVG (plain text, no plotting dependency) in a process
+pool and written to a content-addressed disk cache: the file name is a hash of
+the artifact kind, renderer version and input data. Unchanged inputs therefore
+reuse the file rendered on a previous run, and the Decision only carries a small
+reference (`path`, `sha256`, `content_type`) instead of an inline base64 blob.
+"""
+import hashlib
+import html
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.types import Decision
+
+# Bump when rendering output changes so stale cached files are not reused.
+RENDERER_VERSION = "1"
+
+_WIDTH, _HEIGHT, _PAD = 640, 320, 32
+_LINE_COLORS = ("#1f77b4", "#ff7f0e", "#2ca02c", "#d62728")
+
+
+class ArtifactJob(NamedTuple):
+    """One artifact to render for a ticker.
+
+    kind: "price_chart" (data: {"dates": [...], "close": [...], "ma_windows": [50, 200]})
+          or "valuation_heatmap" (data: {"rows": [...], "cols": [...], "values": [[...], ...]}).
+    """
+    ticker: str
+    name: str
+    kind: str
+    data: Dict[str, Any]
+
+
+def _polyline(values: Sequence[Optional[float]], lo: float, hi: float, color: str) -> str:
+    n = len(values)
+    span = (hi - lo) or 1.0
+    points = []
+    for i, v in enumerate(values):
+        if v is None:
+            continue
+        x = _PAD + (_WIDTH - 2 * _PAD) * (i / max(1, n - 1))
+        y = _HEIGHT - _PAD - (_HEIGHT - 2 * _PAD) * ((v - lo) / span)
+        points.append(f"{x:.1f},{y:.1f}")
+    return f'<polyline fill="none" stroke="{color}" stroke-width="1" points="{" ".join(points)}"/>'
+
+
+def _moving_average(values: Sequence[float], window: int) -> List[Optional[float]]:
+    if window < 1:
+        raise ValueError(f"moving-average window must be >= 1, got {window!r}")
+    out: List[Optional[float]] = []
+    total = 0.0
+    for i, v in enumerate(values):
+        total += v
+        if i >= window:
+            total -= values[i - window]
+        out.append(total / window if i >= window - 1 else None)
+    return out
+
+
+def render_price_chart(data: Dict[str, Any]) -> str:
+    """Render closes plus simple moving averages as an SVG line chart."""
+    closes = [float(c) for c in data.get("close") or []]
+    series = [closes] + [_moving_average(closes, w) for w in data.get("ma_windows", (50, 200))]
+    present = [v for s in series for v in s if v is not None]
+    lo, hi = (min(present), max(present)) if present else (0.0, 1.0)
+    lines = [_polyline(s, lo, hi, _LINE_COLORS[i % len(_LINE_COLORS)]) for i, s in enumerate(series)]
+    dates = data.get("dates") or []
+    label = f"{dates[0]} - {dates[-1]}" if dates else ""
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_WIDTH}" height="{_HEIGHT}">'
+        f'<text x="{_PAD}" y="{_PAD - 10}" font-size="12">{html.escape(label)}</text>'
+        + "".join(lines)
+        + "</svg>"
+    )
+
+
+def render_valuation_heatmap(data: Dict[str, Any]) -> str:
+    """Render a sensitivity table (e.g. fair value by WACC x terminal growth) as an SVG heatmap.
+
+    `None` cells (e.g. WACC <= terminal growth) are drawn grey and left unlabelled.
+    """
+    rows, cols, values = data.get("rows") or [], data.get("cols") or [], data.get("values") or []
+    flat = [v for row in values for v in row if v is not None]
+    lo, hi = (min(flat), max(flat)) if flat else (0.0, 1.0)
+    span = (hi - lo) or 1.0
+    cell_w = (_WIDTH - 2 * _PAD) / max(1, len(cols))
+    cell_h = (_HEIGHT - 2 * _PAD) / max(1, len(rows))
+    cells = []
+    for i, row in enumerate(values):
+        for j, v in enumerate(row):
+            x, y = _PAD + j * cell_w, _PAD + i * cell_h
+            rect = f'<rect x="{x:.1f}" y="{y:.1f}" width="{cell_w:.1f}" height="{cell_h:.1f}"'
+            if v is None:
+                cells.append(f'{rect} fill="#cccccc"/>')
+                continue
+            t = (v - lo) / span
+            color = f"rgb({int(255 * (1 - t))},{int(200 * t + 55)},90)"
+            cells.append(
+                f'{rect} fill="{color}"/>'
+                f'<text x="{x + 4:.1f}" y="{y + cell_h / 2:.1f}" font-size="10">{v:.2f}</text>'
+            )
+    col_labels = "".join(
+        f'<text x="{_PAD + j * cell_w + 4:.1f}" y="{_PAD - 6}" font-size="10">{html.escape(str(c))}</text>' for j, c in enumerate(cols)
+    )
+    row_labels = "".join(
+        f'<text x="2" y="{_PAD + i * cell_h + cell_h / 2:.1f}" font-size="10">{html.escape(str(r))}</text>' for i, r in enumerate(rows)
+    )
+    return f'<svg xmlns="http://www.w3.org/2000/svg" width="{_WIDTH}" height="{_HEIGHT}">{col_labels}{row_labels}{"".join(cells)}</svg>'
+
+
+RENDERERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "price_chart": render_price_chart,
+    "valuation_heatmap": render_valuation_heatmap,
+}
+
+
+def artifact_key(kind: str, data: Dict[str, Any]) -> str:
+    """Content hash identifying a rendered artifact."""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{kind}:{RENDERER_VERSION}:{canonical}".encode("utf-8")).hexdigest()
+
+
+def _render_to_file(kind: str, data: Dict[str, Any], path: str) -> str:
+    """Render one artifact and write it atomically; runs in a worker process."""
+    svg = RENDERERS[kind](data)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.write(svg)
+    os.replace(tmp, path)
+    return path
+
+
+class ArtifactRenderer:
+    """Render artifacts in a process pool with a content-addressed disk cache."""
+
+    def __init__(self, cache_dir: str, max_workers: Optional[int] = None) -> None:
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.hits = 0
+        self.misses = 0
+        # (ticker, name) -> error message for jobs that failed in the last `render_many` call.
+        self.failures: Dict[Tuple[str, str], str] = {}
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.svg")
+
+    def render_many(self, jobs: Iterable[ArtifactJob]) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """Render (or reuse) every job and return `{ticker: {name: reference}}`.
+
+        A job whose rendering fails gets no reference; its error is recorded in
+        `self.failures` and the rest of the batch is unaffected.
+        """
+        refs: Dict[str, Dict[str, Dict[str, str]]] = {}
+        pending: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        owners: Dict[str, List[Tuple[str, str]]] = {}
+        self.failures = {}
+        for job in jobs:
+            if job.kind not in RENDERERS:
+                raise ValueError(f"unknown artifact kind {job.kind!r}")
+            key = artifact_key(job.kind, job.data)
+            path = self.path_for(key)
+            refs.setdefault(job.ticker, {})[job.name] = {
+                "path": path,
+                "sha256": key,
+                "content_type": "image/svg+xml",
+            }
+            if path in pending:
+                owners[path].append((job.ticker, job.name))
+            elif os.path.exists(path):
+                self.hits += 1
+            else:
+                self.misses += 1
+                pending[path] = (job.kind, job.data)
+                owners[path] = [(job.ticker, job.name)]
+
+        errors: Dict[str, str] = {}
+        if len(pending) > 1 and self.max_workers != 1:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {path: pool.submit(_render_to_file, kind, data, path) for path, (kind, data) in pending.items()}
+                for path, future in futures.items():
+                    exc = future.exception()
+                    if exc is not None:
+                        errors[path] = f"{type(exc).__name__}: {exc}"
+        else:
+            for path, (kind, data) in pending.items():
+                try:
+                    _render_to_file(kind, data, path)
+                except Exception as exc:
+                    errors[path] = f"{type(exc).__name__}: {exc}"
+
+        for path, message in errors.items():
+            for ticker, name in owners[path]:
+                self.failures[(ticker, name)] = message
+                del refs[ticker][name]
+                if not refs[ticker]:
+                    del refs[ticker]
+        return refs
+
+    @staticmethod
+    def attach(decision: Decision, refs: Dict[str, Dict[str, str]]) -> Decision:
+        """Return a copy of `decision` with `refs` merged into `artifacts`."""
+        artifacts = dict(decision.artifacts or {})
+        artifacts.update(refs)
+        copy = getattr(decision, "model_copy", None) or getattr(decision, "copy", None)
+        if not copy:
+            raise RuntimeError("Unsupported Pydantic version: missing model_copy/copy.")
+        return copy(update={"artifacts": artifacts})
@@ -0,0 +1,248 @@
+"""
+Indexed local store for archived `Decision` objects.
+
+Decisions are persisted in a SQLite database (stdlib, no server) with the
+queryable fields lifted into their own columns and covered by secondary
+indexes. The full Decision is kept as a JSON payload and only re-validated for
+rows that match a query, so filters over millions of archived rows are answered
+from the indexes rather than by loading and scanning every Decision.
+"""
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from src.types import Decision
+
+# (low, high) inclusive bounds; either side may be None for an open range.
+Range = Tuple[Optional[float], Optional[float]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decisions (
+    ticker TEXT NOT NULL,
+    as_of TEXT NOT NULL,
+    recommendation TEXT NOT NULL,
+    risk_rating TEXT NOT NULL,
+    sector TEXT,
+    target_price_12m REAL NOT NULL,
+    expected_total_return_pct REAL NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (ticker, as_of)
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_as_of ON decisions (as_of, recommendation, risk_rating);
+CREATE INDEX IF NOT EXISTS idx_decisions_recommendation ON decisions (recommendation, as_of);
+CREATE INDEX IF NOT EXISTS idx_decisions_risk_rating ON decisions (risk_rating, as_of);
+CREATE INDEX IF NOT EXISTS idx_decisions_sector ON decisions (sector, as_of);
+CREATE INDEX IF NOT EXISTS idx_decisions_target_price ON decisions (target_price_12m);
+CREATE INDEX IF NOT EXISTS idx_decisions_expected_return ON decisions (expected_total_return_pct);
+CREATE INDEX IF NOT EXISTS idx_decisions_as_of_target_price ON decisions (as_of, target_price_12m);
+CREATE INDEX IF NOT EXISTS idx_decisions_as_of_expected_return ON decisions (as_of, expected_total_return_pct);
+CREATE INDEX IF NOT EXISTS idx_decisions_sector_target_price ON decisions (sector, target_price_12m);
+CREATE INDEX IF NOT EXISTS idx_decisions_sector_expected_return ON decisions (sector, expected_total_return_pct);
+"""
+
+# Accepted `order_by` values -> ORDER BY columns.
+_ORDERS: Dict[str, Tuple[str, ...]] = {
+    "as_of": ("as_of", "ticker"),
+    "ticker": ("ticker", "as_of"),
+    "target_price_12m": ("target_price_12m", "as_of", "ticker"),
+    "expected_total_return_pct": ("expected_total_return_pct", "as_of", "ticker"),
+}
+
+_INSERT = (
+    "INSERT OR REPLACE INTO decisions (ticker, as_of, recommendation, risk_rating, sector, "
+    "target_price_12m, expected_total_return_pct, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+class RecommendationChange(NamedTuple):
+    """A ticker whose recommendation differs between two `as_of` dates."""
+    ticker: str
+    old: str
+    new: str
+
+
+def _dump_json(decision: Decision) -> str:
+    """Serialize a Decision to JSON (Pydantic v2 `model_dump_json` / v1 `json`)."""
+    dump = getattr(decision, "model_dump_json", None) or getattr(decision, "json", None)
+    if not dump:
+        raise RuntimeError("Unsupported Pydantic version: missing model_dump_json/json.")
+    return dump()
+
+
+class DecisionStore:
+    """Archive of Decisions with secondary indexes for fast filtering.
+
+    Usage:
+        store = DecisionStore("decisions.db")
+        store.put_many(decisions, sectors={"AAPL": "Technology"})
+        store.query(as_of="2025-08-08", recommendation="BUY", risk_rating="Low",
+                    expected_total_return_pct=(15.0, None))
+        store.diff("2025-08-04", "2025-08-08")
+
+    Decision has no sector field, so the sector is supplied when storing
+    (typically from `MacroIndustrySummary.sector`) or read from
+    `decision.assumptions["sector"]` if present.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM decisions").fetchone()[0]
+
+    # ----- Writes -----
+
+    def put(self, decision: Decision, sector: Optional[str] = None) -> None:
+        """Insert or replace the Decision for its (ticker, as_of)."""
+        self.put_many([decision], sectors={decision.ticker: sector} if sector else None)
+
+    def put_many(self, decisions: Iterable[Decision], sectors: Optional[Dict[str, str]] = None) -> int:
+        """Bulk insert Decisions in a single transaction; returns the number written."""
+        sectors = sectors or {}
+        rows = [self._row(d, sectors.get(d.ticker)) for d in decisions]
+        with self._conn:
+            self._conn.executemany(_INSERT, rows)
+        return len(rows)
+
+    @staticmethod
+    def _row(decision: Decision, sector: Optional[str]) -> Tuple[Any, ...]:
+        if sector is None:
+            fallback = decision.assumptions.get("sector")
+            sector = fallback if isinstance(fallback, str) else None
+        return (
+            decision.ticker,
+            decision.as_of,
+            decision.recommendation,
+            decision.risk_rating,
+            sector,
+            decision.target_price_12m,
+            decision.expected_total_return_pct,
+            _dump_json(decision),
+        )
+
+    # ----- Reads -----
+
+    def get(self, ticker: str, as_of: str) -> Optional[Decision]:
+        row = self._conn.execute(
+            "SELECT payload FROM decisions WHERE ticker = ? AND as_of = ?", (ticker, as_of)
+        ).fetchone()
+        return Decision.validate_or_raise(json.loads(row[0])) if row else None
+
+    def query(
+        self,
+        *,
+        ticker: Optional[str] = None,
+        as_of: Optional[str] = None,
+        recommendation: Optional[str] = None,
+        risk_rating: Optional[str] = None,
+        sector: Optional[str] = None,
+        target_price_12m: Optional[Range] = None,
+        expected_total_return_pct: Optional[Range] = None,
+        limit: Optional[int] = None,
+        order_by: Optional[str] = "as_of",
+    ) -> List[Decision]:
+        """Return Decisions matching every given filter, ordered by (as_of, ticker).
+
+        Equality filters apply to the string fields; numeric fields take an
+        inclusive `(low, high)` range where either bound may be None.
+        `order_by` may also be "ticker", "target_price_12m",
+        "expected_total_return_pct" or None (unordered, cheapest).
+        """
+        filters = {
+            "ticker": ticker,
+            "as_of": as_of,
+            "recommendation": recommendation,
+            "risk_rating": risk_rating,
+            "sector": sector,
+            "target_price_12m": target_price_12m,
+            "expected_total_return_pct": expected_total_return_pct,
+        }
+        return [Decision.validate_or_raise(json.loads(p)) for (p,) in self._select("payload", filters, limit, order_by)]
+
+    def keys(
+        self,
+        *,
+        ticker: Optional[str] = None,
+        as_of: Optional[str] = None,
+        recommendation: Optional[str] = None,
+        risk_rating: Optional[str] = None,
+        sector: Optional[str] = None,
+        target_price_12m: Optional[Range] = None,
+        expected_total_return_pct: Optional[Range] = None,
+        limit: Optional[int] = None,
+        order_by: Optional[str] = "as_of",
+    ) -> List[Tuple[str, str]]:
+        """Like `query` but returns only `(ticker, as_of)` pairs, skipping payload decoding."""
+        filters = {
+            "ticker": ticker,
+            "as_of": as_of,
+            "recommendation": recommendation,
+            "risk_rating": risk_rating,
+            "sector": sector,
+            "target_price_12m": target_price_12m,
+            "expected_total_return_pct": expected_total_return_pct,
+        }
+        return [tuple(r) for r in self._select("ticker, as_of", filters, limit, order_by)]
+
+    def diff(self, as_of_old: str, as_of_new: str) -> List[RecommendationChange]:
+        """Tickers present on both dates whose recommendation changed, ordered by ticker."""
+        rows = self._conn.execute(
+            "SELECT a.ticker, a.recommendation, b.recommendation FROM decisions a "
+            "JOIN decisions b ON b.ticker = a.ticker AND b.as_of = ? "
+            "WHERE a.as_of = ? AND a.recommendation != b.recommendation ORDER BY a.ticker",
+            (as_of_new, as_of_old),
+        ).fetchall()
+        return [RecommendationChange(*r) for r in rows]
+
+    def _select(
+        self, columns: str, filters: Dict[str, Any], limit: Optional[int], order_by: Optional[str]
+    ) -> List[Tuple[Any, ...]]:
+        sql, params = self._build_select(columns, filters, limit, order_by)
+        return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _build_select(
+        columns: str, filters: Dict[str, Any], limit: Optional[int], order_by: Optional[str]
+    ) -> Tuple[str, List[Union[str, float, int]]]:
+        if order_by is not None and order_by not in _ORDERS:
+            raise ValueError(f"order_by must be one of {sorted(_ORDERS)} or None, got {order_by!r}")
+        clauses: List[str] = []
+        params: List[Union[str, float, int]] = []
+        for field in ("ticker", "as_of", "recommendation", "risk_rating", "sector"):
+            value = filters.get(field)
+            if value is not None:
+                clauses.append(f"{field} = ?")
+                params.append(value)
+        ranged = False
+        for field in ("target_price_12m", "expected_total_return_pct"):
+            bounds = filters.get(field)
+            if bounds is None:
+                continue
+            if not isinstance(bounds, (tuple, list)) or len(bounds) != 2:
+                raise ValueError(f"{field} must be a (low, high) tuple, got {bounds!r}")
+            low, high = bounds
+            if low is not None:
+                clauses.append(f"{field} >= ?")
+                params.append(low)
+            if high is not None:
+                clauses.append(f"{field} <= ?")
+                params.append(high)
+            ranged = ranged or low is not None or high is not None
+        sql = f"SELECT {columns} FROM decisions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if order_by is not None:
+            order = list(_ORDERS[order_by])
+            if ranged:
+                # Unary + stops SQLite from walking an ORDER BY index over the
+                # whole table; it seeks the range index and sorts the matches.
+                order[0] = "+" + order[0]
+            sql += " ORDER BY " + ", ".join(order)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
@@ -0,0 +1,290 @@
+"""
+Deterministic load generator and throughput driver for the full pipeline.
+
+Three pieces:
+  - `SyntheticMarket`: a reproducible synthetic universe (prices, fundamentals,
+    news, macro, peers). Each ticker's data is derived from `(seed, ticker)`
+    on demand, so a 10k tickers x 20 years market costs no memory until used
+    and two runs with the same seed see identical data.
+  - `SyntheticAPIFetcher`: a local stand-in for the `APIFetcher` endpoints
+    serving that market with configurable latency and error rate.
+  - `LoadDriver`: drives `Orchestrator.run` at a target rate and reports
+    tickers/sec, per-stage latency percentiles and peak memory.
+
+Run with:  python -m src.tools.load_generator --tickers 10000 --years 20 --rate 200
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.orchestrator.orchestrator import Orchestrator
+from src.tools.api_fetcher import APIFetcher
+
+try:  # Unix only; peak memory is reported as None elsewhere.
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+_SECTORS = ("Technology", "Energy", "Financials", "Health Care", "Industrials", "Materials", "Utilities")
+_REGIMES = ("Rising", "Falling", "Stable")
+_FX = ("Headwind", "Tailwind", "Neutral")
+_COMMODITIES = ("Oil", "Copper", "Gas", "Gold", "Wheat")
+
+
+class SyntheticFetchError(RuntimeError):
+    """Injected failure raised by `SyntheticAPIFetcher`."""
+
+
+class SyntheticMarket:
+    """Reproducible synthetic market data keyed by `(seed, ticker)`."""
+
+    ENDPOINTS = ("prices", "fundamentals", "news", "macro", "peers")
+
+    def __init__(self, n_tickers: int = 100, years: int = 5, seed: int = 0, end: str = "2025-08-08") -> None:
+        self.seed = seed
+        self.years = years
+        self.tickers = [f"T{i:05d}" for i in range(n_tickers)]
+        self._index = {t: i for i, t in enumerate(self.tickers)}
+        end_day = date.fromisoformat(end)
+        day = end_day - timedelta(days=365 * years)
+        calendar: List[str] = []
+        while day <= end_day:
+            if day.weekday() < 5:
+                calendar.append(day.isoformat())
+            day += timedelta(days=1)
+        self.calendar = calendar
+
+    def _rng(self, ticker: str, endpoint: str) -> random.Random:
+        return random.Random(f"{self.seed}:{ticker}:{endpoint}")
+
+    def fetch(self, endpoint: str, ticker: str) -> Any:
+        if endpoint not in self.ENDPOINTS:
+            raise KeyError(f"unknown endpoint {endpoint!r}")
+        if ticker not in self._index:
+            return None
+        return getattr(self, f"_{endpoint}")(ticker, self._rng(ticker, endpoint))
+
+    def _prices(self, ticker: str, rng: random.Random) -> Dict[str, Any]:
+        drift = rng.uniform(-0.0002, 0.0008)
+        vol = rng.uniform(0.008, 0.03)
+        price = rng.uniform(5.0, 500.0)
+        closes = []
+        for _ in self.calendar:
+            price *= math.exp(rng.gauss(drift, vol))
+            closes.append(round(price, 4))
+        return {"dates": self.calendar, "close": closes}
+
+    def _fundamentals(self, ticker: str, rng: random.Random) -> Dict[str, Any]:
+        revenue = rng.uniform(1e8, 5e10)
+        growth = rng.uniform(-0.05, 0.25)
+        margin = rng.uniform(0.02, 0.35)
+        revenues, margins, fcfs = [], [], []
+        for _ in range(self.years):
+            revenue *= 1 + rng.gauss(growth, 0.05)
+            margin = min(0.6, max(-0.2, margin + rng.gauss(0, 0.01)))
+            revenues.append(revenue)
+            margins.append(margin)
+            fcfs.append(revenue * margin * rng.uniform(0.5, 0.9))
+        return {"revenue_history": revenues, "op_margin_history": margins, "fcf_history": fcfs}
+
+    def _news(self, ticker: str, rng: random.Random) -> Dict[str, Any]:
+        items = [
+            {"id": f"{ticker}-n{i}", "date": rng.choice(self.calendar[-90:]), "score": round(rng.uniform(-1, 1), 3)}
+            for i in range(rng.randint(0, 50))
+        ]
+        return {"items": items}
+
+    def _macro(self, ticker: str, rng: random.Random) -> Dict[str, Any]:
+        return {
+            "rate_regime": rng.choice(_REGIMES),
+            "inflation_trend": rng.choice(_REGIMES),
+            "fx_headwind_tailwind": rng.choice(_FX),
+            "commodity_links": rng.sample(_COMMODITIES, rng.randint(0, 2)),
+            "sector": _SECTORS[self._index[ticker] % len(_SECTORS)],
+        }
+
+    def _peers(self, ticker: str, rng: random.Random) -> Dict[str, Any]:
+        sector = self._index[ticker] % len(_SECTORS)
+        same = [t for t in self.tickers[sector::len(_SECTORS)] if t != ticker]
+        return {"peers": rng.sample(same, min(5, len(same)))}
+
+
+class SyntheticAPIFetcher(APIFetcher):
+    """`APIFetcher` stand-in serving a `SyntheticMarket` with latency and failures.
+
+    latency_s is the mean per-call delay (jittered by +/- `jitter` fraction);
+    error_rate is the probability a call raises `SyntheticFetchError`. Both
+    draws are derived from `(seed, ticker, endpoint)`, so which calls fail and
+    how long they take does not depend on call order or thread scheduling.
+    """
+
+    def __init__(
+        self,
+        market: SyntheticMarket,
+        latency_s: float = 0.0,
+        error_rate: float = 0.0,
+        jitter: float = 0.5,
+        seed: int = 0,
+    ) -> None:
+        self.market = market
+        self.latency_s = latency_s
+        self.error_rate = error_rate
+        self.jitter = jitter
+        self.seed = seed
+
+    def fetch(self, endpoint: str, params: dict) -> Any:
+        rng = random.Random(f"{self.seed}:{params.get('ticker')}:{endpoint}:fetch")
+        delay = self.latency_s * (1 + rng.uniform(-self.jitter, self.jitter))
+        fail = rng.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise SyntheticFetchError(f"injected failure on {endpoint} for {params.get('ticker')}")
+        return self.market.fetch(endpoint, params.get("ticker"))
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of `values` (0 < pct <= 100); None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class _StageTimer:
+    """Collects latency samples per stage name."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+
+class _TimedFetcher(APIFetcher):
+    def __init__(self, inner: APIFetcher, timer: _StageTimer) -> None:
+        self.inner = inner
+        self.timer = timer
+
+    def fetch(self, endpoint: str, params: dict) -> Any:
+        start = time.perf_counter()
+        try:
+            return self.inner.fetch(endpoint, params)
+        finally:
+            self.timer.record(f"fetch:{endpoint}", time.perf_counter() - start)
+
+
+class _TimedEngine:
+    def __init__(self, name: str, inner: Any, timer: _StageTimer) -> None:
+        self.name = name
+        self.inner = inner
+        self.timer = timer
+
+    def analyze(self, data: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return self.inner.analyze(data)
+        finally:
+            self.timer.record(self.name, time.perf_counter() - start)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux.
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+class LoadDriver:
+    """Drive an `Orchestrator` over a list of tickers at a target rate.
+
+    The orchestrator's fetcher and engines are wrapped with timers so each
+    stage's latency is recorded without changing the orchestrator itself.
+    `rate` is tickers/sec submitted (None = as fast as `workers` allow).
+    """
+
+    def __init__(self, orchestrator: Orchestrator, rate: Optional[float] = None, workers: int = 8) -> None:
+        self.timer = _StageTimer()
+        self.orchestrator = orchestrator
+        self.orchestrator.fetcher = _TimedFetcher(orchestrator.fetcher, self.timer)
+        self.orchestrator.engines = {
+            name: _TimedEngine(name, engine, self.timer) for name, engine in orchestrator.engines.items()
+        }
+        self.rate = rate
+        self.workers = workers
+
+    def run(self, tickers: Sequence[str], as_of: Optional[str] = None) -> Dict[str, Any]:
+        """Run every ticker once and return the throughput report."""
+        errors: List[str] = []
+        errors_lock = threading.Lock()
+
+        def one(ticker: str) -> None:
+            start = time.perf_counter()
+            try:
+                self.orchestrator.run({"ticker": ticker, "as_of": as_of})
+            except Exception:
+                with errors_lock:
+                    errors.append(ticker)
+            finally:
+                self.timer.record("total", time.perf_counter() - start)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for i, ticker in enumerate(tickers):
+                if self.rate:
+                    wait = started + i / self.rate - time.perf_counter()
+                    if wait > 0:
+                        time.sleep(wait)
+                pool.submit(one, ticker)
+        elapsed = time.perf_counter() - started
+
+        return {
+            "tickers": len(tickers),
+            "errors": len(errors),
+            "elapsed_s": elapsed,
+            "tickers_per_sec": len(tickers) / elapsed if elapsed > 0 else None,
+            "peak_rss_mb": _peak_rss_mb(),
+            "stages": {
+                stage: {
+                    "count": len(samples),
+                    "p50_ms": percentile(samples, 50) * 1000,
+                    "p95_ms": percentile(samples, 95) * 1000,
+                    "p99_ms": percentile(samples, 99) * 1000,
+                    "max_ms": max(samples) * 1000,
+                }
+                for stage, samples in sorted(self.timer.samples.items())
+            },
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive the AlphaLensAI pipeline against a synthetic market.")
+    parser.add_argument("--tickers", type=int, default=1000)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--as-of", default="2025-08-08")
+    parser.add_argument("--rate", type=float, default=None, help="Target tickers/sec (default: unthrottled).")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean synthetic fetch latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability a fetch fails.")
+    args = parser.parse_args()
+
+    market = SyntheticMarket(n_tickers=args.tickers, years=args.years, seed=args.seed, end=args.as_of)
+    fetcher = SyntheticAPIFetcher(market, latency_s=args.latency_ms / 1000, error_rate=args.error_rate, seed=args.seed)
+    driver = LoadDriver(Orchestrator(fetcher=fetcher), rate=args.rate, workers=args.workers)
+    print(json.dumps(driver.run(market.tickers, as_of=args.as_of), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,253 @@
 """
-Validation tool stub for pipeline data.
+Validation tool for pipeline data.
+
+Two modes:
+  - `validate`: schema check of a single output against the `Decision` contract;
+  - `check_quality` / `quality_mask`: bulk data-quality scan of the raw price
+    and statement arrays for a whole universe, run before the engine and LLM
+    stages so bad tickers can be skipped or quarantined.
 """
-from typing import Any
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from src.types import Decision
+
+# Split ratios (and their inverses) that an unadjusted price series shows as a
+# one-day jump, e.g. 2-for-1 -> close roughly halves.
+_SPLIT_FACTORS = (2, 3, 4, 5, 8, 10, 15, 20)
+
 
 class Validator:
-    """Validates pipeline data and outputs."""
+    """Validates pipeline data and outputs.
+
+    Thresholds for the data-quality mode:
+        max_gap_days: calendar days between bars before a gap counts as missing
+            bars (covers weekends and single holidays by default).
+        stale_run: number of consecutive identical closes flagged as stale.
+        max_abs_return: absolute daily return above which a bar is an outlier
+            (confirmed split-sized moves are reported as splits instead).
+        split_tolerance: relative tolerance when matching a move to a split ratio.
+        split_confirm_bars / split_band: a split-sized move only counts as an
+            unadjusted split if the next `split_confirm_bars` closes all stay
+            within `split_band` of the post-jump close; otherwise it is an outlier.
+
+    Limitation: without an adjusted price series to compare against, a genuine
+    crash or gap that lands on a split ratio (e.g. -50%, -67%, +100%) and then
+    holds its new level is indistinguishable from an unadjusted split and is
+    reported as `unadjusted_split`. Both outcomes fail the ticker.
+    """
+
+    def __init__(
+        self,
+        max_gap_days: int = 5,
+        stale_run: int = 5,
+        max_abs_return: float = 0.4,
+        split_tolerance: float = 0.03,
+        split_confirm_bars: int = 3,
+        split_band: float = 0.1,
+    ) -> None:
+        self.max_gap_days = max_gap_days
+        self.stale_run = stale_run
+        self.max_abs_return = max_abs_return
+        self.split_tolerance = split_tolerance
+        self.split_confirm_bars = split_confirm_bars
+        self.split_band = split_band
+
     def validate(self, data: Any) -> bool:
-        """Validate input or output data."""
-        pass
+        """Validate input or output data against the `Decision` contract."""
+        if not data:
+            return False
+        if isinstance(data, Decision):
+            return True
+        try:
+            Decision.validate_or_raise(data)
+        except Exception:
+            return False
+        return True
+
+    # ----- Data-quality mode -----
+
+    def quality_mask(self, universe: Mapping[str, Mapping[str, Any]]) -> Dict[str, bool]:
+        """Return `{ticker: passed}` for every ticker in `universe`."""
+        return {ticker: not issues for ticker, issues in self.check_quality(universe).items()}
+
+    def check_quality(self, universe: Mapping[str, Mapping[str, Any]]) -> Dict[str, List[str]]:
+        """Scan each ticker's raw inputs and return `{ticker: [issue, ...]}`.
+
+        Expected per-ticker input (the same payload `Orchestrator.run` takes):
+        {
+            "technicals": {"dates": ["2025-08-01", ...], "close": [101.2, ...]},
+            "fundamentals": {"revenue_history": [...], ...},
+        }
+        Sections that are absent are not checked. An empty list means the
+        ticker passed. Values are coerced to float (None / NaN closes count as
+        missing bars); data that cannot be coerced is reported as `bad_closes`
+        or `bad_revenue` for that ticker rather than failing the scan.
+
+        The price and revenue series of every ticker are concatenated and
+        checked in single numpy passes over the whole universe.
+        """
+        issues: Dict[str, List[str]] = {ticker: [] for ticker in universe}
+        closes: Dict[str, np.ndarray] = {}
+        ordinals: Dict[str, Optional[np.ndarray]] = {}
+        revenues: Dict[str, np.ndarray] = {}
+        calendars: Dict[Any, Optional[np.ndarray]] = {}  # tickers usually share one trading calendar
+        for ticker, payload in universe.items():
+            payload = payload or {}
+            prices = payload.get("technicals")
+            if isinstance(prices, Mapping):
+                dates = prices.get("dates")
+                dates = [] if dates is None else dates
+                close = prices.get("close")
+                values = _as_floats([] if close is None else close)
+                if values is None:
+                    issues[ticker].append("bad_closes")
+                elif not hasattr(dates, "__len__") or len(dates) != len(values):
+                    issues[ticker].append("length_mismatch")
+                elif len(values):
+                    closes[ticker], ordinals[ticker] = values, _cached_ordinals(dates, calendars)
+            statements = payload.get("fundamentals")
+            if isinstance(statements, Mapping):
+                history = statements.get("revenue_history") or statements.get("revenues") or []
+                values = _as_floats(history)
+                if values is None:
+                    revenues[ticker] = np.empty(0)
+                    issues[ticker].append("bad_revenue")
+                else:
+                    revenues[ticker] = values
+
+        price_issues = self._scan_prices(closes, ordinals)
+        negative = _any_per_series(revenues, lambda v: v < 0)
+        for ticker in universe:
+            issues[ticker][:0] = price_issues.get(ticker, [])
+            if negative.get(ticker):
+                issues[ticker].append("negative_revenue")
+        return issues
+
+    def _scan_prices(
+        self, closes: Dict[str, np.ndarray], ordinals: Dict[str, Optional[np.ndarray]]
+    ) -> Dict[str, List[str]]:
+        """Price checks for every ticker at once over the concatenated close series."""
+        if not closes:
+            return {}
+        tickers = list(closes)
+        lengths = np.array([len(closes[t]) for t in tickers])
+        owner = np.repeat(np.arange(len(tickers)), lengths)
+        c = np.concatenate([closes[t] for t in tickers])
+        days = np.concatenate([
+            ordinals[t] if ordinals[t] is not None else np.zeros(len(closes[t]), dtype=np.int64) for t in tickers
+        ])
+        n = len(tickers)
+
+        def per_ticker(mask: np.ndarray, at: np.ndarray) -> np.ndarray:
+            return np.bincount(at[mask], minlength=n) > 0
+
+        missing = per_ticker(~(c > 0), owner)  # None -> NaN, and NaN > 0 is False
+        same = owner[1:] == owner[:-1]  # consecutive bars of one ticker
+        pair_owner = owner[1:]
+
+        gaps = np.diff(days)
+        unordered = per_ticker(same & (gaps <= 0), pair_owner)
+        gapped = per_ticker(same & (gaps > self.max_gap_days), pair_owner)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = c[1:] / c[:-1]
+        flat = same & (ratios == 1.0)
+        count = np.cumsum(flat)
+        run = count - np.maximum.accumulate(np.where(flat, 0, count))  # consecutive flat returns
+        stale = per_ticker(run >= self.stale_run - 1, pair_owner)
+
+        big = same & ~(np.abs(ratios - 1.0) <= self.max_abs_return)
+        jumps = np.flatnonzero(big)
+        split = np.zeros(len(ratios), dtype=bool)
+        split[jumps] = self._split_like(ratios[jumps]) & self._level_holds(c, owner, jumps + 1)
+        splits = per_ticker(split, pair_owner)
+        outliers = per_ticker(big & ~split, pair_owner)
+
+        found: Dict[str, List[str]] = {}
+        for i, ticker in enumerate(tickers):
+            if missing[i]:
+                found[ticker] = ["missing_bars"]
+                continue
+            if ordinals[ticker] is None:
+                found[ticker] = ["bad_dates"]
+                continue
+            issues: List[str] = []
+            if unordered[i]:
+                issues.append("non_monotonic_dates")
+            elif gapped[i]:
+                issues.append("missing_bars")
+            if stale[i]:
+                issues.append("stale_prices")
+            if splits[i]:
+                issues.append("unadjusted_split")
+            if outliers[i]:
+                issues.append("outlier_return")
+            found[ticker] = issues
+        return found
+
+    def _split_like(self, ratios: np.ndarray) -> np.ndarray:
+        """Mask of returns whose jump (or its inverse) matches a split ratio."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            jump = np.where(ratios >= 1.0, ratios, 1.0 / ratios)
+        factors = np.array(_SPLIT_FACTORS, dtype=float)
+        return (np.abs(jump[:, None] - factors) <= factors * self.split_tolerance).any(axis=1)
+
+    def _level_holds(self, closes: np.ndarray, owner: np.ndarray, base: np.ndarray) -> np.ndarray:
+        """For each post-jump index in `base`: the next `split_confirm_bars` closes stay near it."""
+        holds = np.ones(len(base), dtype=bool)
+        for step in range(1, self.split_confirm_bars + 1):
+            nxt = base + step
+            inside = nxt < len(closes)
+            nxt = np.minimum(nxt, len(closes) - 1)
+            holds &= inside & (owner[nxt] == owner[base])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                holds &= np.abs(closes[nxt] / closes[base] - 1.0) <= self.split_band
+        return holds
+
+
+def _as_floats(values: Sequence[Any]) -> Optional[np.ndarray]:
+    """Coerce a series to float64 (None -> NaN); None if any value is not numeric."""
+    try:
+        array = np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        return None
+    return array if array.ndim == 1 else None
+
+
+def _cached_ordinals(dates: Sequence[Any], cache: Dict[Any, Optional[np.ndarray]]) -> Optional[np.ndarray]:
+    try:
+        key = tuple(dates)
+        hash(key)
+    except TypeError:
+        return None
+    if key not in cache:
+        cache[key] = _as_ordinals(dates)
+    return cache[key]
+
+
+def _as_ordinals(dates: Sequence[Any]) -> Optional[np.ndarray]:
+    """ISO dates as day numbers; None if any date is missing or malformed."""
+    text = np.asarray(dates)
+    if text.dtype.kind != "U":  # None / numbers mixed in
+        return None
+    try:
+        days = text.astype("datetime64[D]")
+    except ValueError:
+        return None
+    if np.isnat(days).any():
+        return None
+    return days.astype(np.int64)
+
+
+def _any_per_series(series: Dict[str, np.ndarray], test: Callable[[np.ndarray], np.ndarray]) -> Dict[str, bool]:
+    """Evaluate `test` over all series concatenated; `{key: any element matched}`."""
+    if not series:
+        return {}
+    keys = list(series)
+    owner = np.repeat(np.arange(len(keys)), [len(series[k]) for k in keys])
+    values = np.concatenate([series[k] for k in keys])
+    with np.errstate(invalid="ignore"):
+        hits = np.bincount(owner[test(values)], minlength=len(keys)) > 0
+    return dict(zip(keys, hits.tolist()))
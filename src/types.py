@@ -188,4 +188,16 @@ class MacroIndustrySummary(BaseModel):
     fx_headwind_tailwind: Optional[Literal["Headwind", "Tailwind", "Neutral"]] = None
     commodity_links: List[str] = Field(default_factory=list, description="Relevant commodity exposures, if any.")
     sector: Optional[str] = None
-    notes: Optional[str] = None
\ No newline at end of file
+    notes: Optional[str] = None
+
+
+class RiskSummary(BaseModel):
+    """
+    Per-ticker risk snapshot from the EWMA risk engine; `risk_rating` feeds `Decision.risk_rating`.
+    """
+    volatility_ann: float = Field(..., ge=0, description="Annualized EWMA volatility of daily returns.")
+    beta: Optional[float] = Field(default=None, description="EWMA beta to the index.")
+    drawdown: float = Field(..., le=0, description="Current drawdown from the running peak (e.g., -0.12).")
+    max_drawdown: float = Field(..., le=0)
+    cluster: Optional[int] = Field(default=None, description="Correlation cluster id, if covariance is tracked.")
+    risk_rating: RiskRating
@@ -1,11 +1,14 @@
 """
 Unit tests for Engines modules.
 """
+import random
+
 import pytest
 from src.engines.fundamentals import FundamentalsEngine
 from src.engines.technicals import TechnicalsEngine
 from src.engines.sentiment import SentimentEngine
 from src.engines.macro import MacroEngine
+from src.engines.risk import RiskEngine
 
 def test_fundamentals_engine():
     engine = FundamentalsEngine()
@@ -41,3 +44,91 @@ def test_macro_engine_sample_input():
     assert out.fx_headwind_tailwind == "Neutral"
     assert out.commodity_links == ["Oil", "Copper"]
     assert out.sector == "Materials"
+
+
+def _random_walk_bars(n_bars=120):
+    rng = random.Random(3)
+    index, a, b, c = 100.0, 50.0, 20.0, 80.0
+    for _ in range(n_bars):
+        m = rng.gauss(0, 0.01)
+        index *= 1 + m
+        a *= 1 + 2 * m + rng.gauss(0, 0.001)  # high beta, tracks the index
+        b *= 1 + 2 * m + rng.gauss(0, 0.001)  # same factor as A
+        c *= 1 + rng.gauss(0, 0.002)  # quiet, uncorrelated
+        yield {"A": a, "B": b, "C": c}, index
+
+
+def test_risk_engine_incremental_measures():
+    engine = RiskEngine(["A", "B", "C"])
+    assert engine.analyze({"ticker": "A"}) is None  # warm-up
+    for closes, index_close in _random_walk_bars():
+        engine.update(closes, index_close)
+
+    a = engine.analyze({"ticker": "A"})
+    c = engine.analyze({"ticker": "C"})
+    assert a.beta > 1.5 and a.risk_rating == "High"
+    assert c.volatility_ann < 0.2 and c.risk_rating == "Low"
+    assert a.max_drawdown <= a.drawdown <= 0
+    assert engine.correlation("A", "B") > 0.9
+    assert a.cluster is None  # clusters are only computed on request
+    clustered = {t: engine.analyze({"ticker": t}, include_cluster=True).cluster for t in "ABC"}
+    assert clustered["A"] == clustered["B"] != clustered["C"]
+    assert engine.analyze(None) is None
+
+
+def test_risk_engine_skips_missing_and_first_bars():
+    engine = RiskEngine(["A", "LATE"], min_bars=20)
+    rng = random.Random(5)
+    a, late, index = 50.0, 30.0, 100.0
+    for bar in range(120):
+        a *= 1 + rng.gauss(0, 0.02)
+        late *= 1 + rng.gauss(0, 0.02)
+        index *= 1 + rng.gauss(0, 0.01)
+        closes = {"A": a}
+        if bar >= 100 and bar % 5:  # listed late, and missing every fifth bar
+            closes["LATE"] = late
+        engine.update(closes, index)
+        if bar == 110:
+            assert engine.analyze({"ticker": "LATE"}) is None  # too few of its own bars
+
+    for _ in range(40):
+        a *= 1 + rng.gauss(0, 0.02)
+        late *= 1 + rng.gauss(0, 0.02)
+        engine.update({"A": a, "LATE": late}, index)
+    # Same return process, so a late listing must not look calmer than A.
+    vol_a = engine.analyze({"ticker": "A"}).volatility_ann
+    vol_late = engine.analyze({"ticker": "LATE"}).volatility_ann
+    assert 0.5 * vol_a < vol_late < 2 * vol_a
+
+
+def test_risk_engine_batched_covariance_matches_rank_one_updates():
+    tickers = ["A", "B", "C"]
+    batched = RiskEngine(tickers, flush_every=7)
+    rng = random.Random(9)
+    prices = [10.0, 20.0, 30.0]
+    returns = []
+    for _ in range(30):
+        prev = list(prices)
+        prices = [p * (1 + rng.gauss(0, 0.02)) for p in prices]
+        batched.update(dict(zip(tickers, prices)), 100.0)
+        returns.append([p / q - 1 for p, q in zip(prices, prev)])
+
+    expected = [[0.0] * 3 for _ in range(3)]
+    for r in returns[1:]:  # the first bar only sets the index's previous close
+        expected = [[0.94 * expected[i][j] + 0.06 * r[i] * r[j] for j in range(3)] for i in range(3)]
+    corr = expected[0][1] / (expected[0][0] * expected[1][1]) ** 0.5
+    assert batched.correlation("A", "B") == pytest.approx(corr)
+
+
+def test_risk_engine_skips_bad_index_closes():
+    engine = RiskEngine(["A"], min_bars=20)
+    rng = random.Random(11)
+    a, index = 50.0, 100.0
+    for bar in range(80):
+        index_return = rng.gauss(0, 0.01)
+        index *= 1 + index_return
+        a *= 1 + 1.2 * index_return + rng.gauss(0, 0.002)
+        engine.update({"A": a}, float("nan") if bar in (30, 31) else (0.0 if bar == 50 else index))
+    summary = engine.analyze({"ticker": "A"})
+    assert summary.beta == pytest.approx(1.2, abs=0.2)
+    assert summary.volatility_ann > 0
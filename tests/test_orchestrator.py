@@ -1,10 +1,242 @@
 """
 Unit tests for Orchestrator module.
 """
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
 import pytest
 from src.orchestrator.orchestrator import Orchestrator
+from src.orchestrator.profiling import Profiler
+from src.tools.validator import Validator
+from src.orchestrator.service import AnalysisService, TTLCache, make_server
+
 
 def test_orchestrator_run():
     """Placeholder test for Orchestrator.run."""
     orchestrator = Orchestrator()
     assert orchestrator.run(None) is None
+
+
+def test_orchestrator_run_uses_inline_inputs():
+    orchestrator = Orchestrator()
+    out = orchestrator.run({"ticker": "TEST", "as_of": "2025-08-11", "macro": {"sector": "Energy"}})
+    assert out["ticker"] == "TEST"
+    assert out["macro"].sector == "Energy"
+    assert out["fundamentals"] is None
+
+
+class _SlowOrchestrator:
+    def __init__(self):
+        self.calls = 0
+
+    def run(self, input_data):
+        self.calls += 1
+        time.sleep(0.05)
+        return {"ticker": input_data["ticker"], "as_of": input_data["as_of"]}
+
+
+def test_service_single_flight_and_cache():
+    orchestrator = _SlowOrchestrator()
+    service = AnalysisService(orchestrator=orchestrator)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.analyze("aapl", "2025-08-11"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert orchestrator.calls == 1
+    assert all(r == {"ticker": "AAPL", "as_of": "2025-08-11"} for r in results)
+
+    service.analyze("AAPL", "2025-08-11")
+    assert orchestrator.calls == 1
+    service.analyze("AAPL", "2025-08-12")
+    assert orchestrator.calls == 2
+
+
+def test_ttl_cache_expiry_and_lru():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)  # evicts least recently used "b"
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    now[0] = 11.0
+    assert cache.get("a") == (False, None)
+
+
+def test_orchestrator_run_batch_quarantines_bad_tickers():
+    orchestrator = Orchestrator()
+    dates = ["2025-08-04", "2025-08-05", "2025-08-06"]
+    out = orchestrator.run_batch(
+        {
+            "GOOD": {"technicals": {"dates": dates, "close": [10.0, 10.1, 10.2]}, "macro": {"sector": "Energy"}},
+            "BAD": {"fundamentals": {"revenue_history": [-1.0, 2.0]}},
+        },
+        as_of="2025-08-06",
+    )
+    assert list(out["results"]) == ["GOOD"]
+    assert out["results"]["GOOD"]["as_of"] == "2025-08-06"
+    assert out["quarantined"] == {"BAD": ["negative_revenue"]}
+
+
+def test_profiler_samples_tickers_and_writes_report(tmp_path):
+    profiler = Profiler(output_dir=str(tmp_path), sample_rate=1.0, top_n=50)
+    orchestrator = Orchestrator(profiler=profiler)
+    dates = ["2025-08-04", "2025-08-05", "2025-08-06"]
+    out = orchestrator.run_batch(
+        {
+            "AAA": {"technicals": {"dates": dates, "close": [10.0, 10.1, 10.2]}},
+            "BBB": {"fundamentals": {"revenue_history": [-1.0, 2.0]}},
+        }
+    )
+    assert list(out["results"]) == ["AAA"]
+
+    run_dirs = list(tmp_path.iterdir())
+    assert len(run_dirs) == 1
+    assert (run_dirs[0] / "merged.prof").exists()
+    assert "analyze" in (run_dirs[0] / "hotspots.txt").read_text()
+    records = json.loads((run_dirs[0] / "tickers.json").read_text())
+    stages = {r["ticker"]: set(r["stages_ms"]) for r in records}
+    assert stages["__batch__"] == {"validate"}
+    assert stages["AAA"] == {"validate", "fundamentals", "technicals", "sentiment", "macro"}
+    assert "BBB" not in stages  # quarantined before the engines
+
+
+def test_run_batch_validates_universe_in_one_scan_and_skips_reports_when_off(tmp_path):
+    calls = []
+
+    class _CountingValidator(Validator):
+        def check_quality(self, universe):
+            calls.append(sorted(universe))
+            return super().check_quality(universe)
+
+    profiler = Profiler(output_dir=str(tmp_path))
+    orchestrator = Orchestrator(validator=_CountingValidator(), profiler=profiler)
+    profiler.records.append({"ticker": "INFLIGHT"})  # e.g. a concurrent service request
+    run_id = profiler.run_id
+    orchestrator.run_batch({"AAA": {}, "BBB": {}})
+    assert calls == [["AAA", "BBB"]]
+    assert profiler.run_id == run_id and profiler.records == [{"ticker": "INFLIGHT"}]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profiler_slow_threshold_and_config_reload(tmp_path):
+    profiler = Profiler(output_dir=str(tmp_path), slow_ms=60_000)
+    orchestrator = Orchestrator(profiler=profiler)
+    orchestrator.run({"ticker": "AAA", "as_of": "2025-08-06"})
+    assert profiler.records == []  # under the threshold: discarded
+
+    config = tmp_path / "profile.json"
+    config.write_text(json.dumps({"sample_rate": 1.0, "output_dir": str(tmp_path / "out")}))
+    profiler = Profiler(config_path=str(config))
+    profiler.reload()
+    assert profiler.enabled and profiler.slow_ms is None
+    Orchestrator(profiler=profiler).run({"ticker": "AAA", "as_of": "2025-08-06"})
+    assert profiler.records[0]["stages_ms"].keys() >= {"fetch", "validate", "macro"}
+    assert profiler.write_report().startswith(str(tmp_path / "out"))
+
+    config.write_text("{}")
+    os.utime(config, (0, 0))
+    profiler.reload()
+    assert not profiler.enabled
+
+
+def test_profiler_config_change_during_session(tmp_path):
+    config = tmp_path / "profile.json"
+    config.write_text(json.dumps({"slow_ms": "0", "output_dir": str(tmp_path / "out")}))
+    profiler = Profiler(config_path=str(config))
+    profiler.reload()
+    assert profiler.slow_ms == 0.0
+
+    with profiler.session("AAA") as prof:
+        with prof.stage("validate"):
+            config.write_text("{}")
+            os.utime(config, (0, 0))
+            profiler.reload()  # profiling switched off while the session is open
+    assert not profiler.enabled
+    assert [r["ticker"] for r in profiler.records] == ["AAA"]
+
+
+def _get(server, path):
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    try:
+        with urllib.request.urlopen(url) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as err:
+        return err.code, json.loads(err.read())
+
+
+def test_service_profiling_report_endpoint(tmp_path):
+    servers = [
+        make_server(AnalysisService(orchestrator=_SlowOrchestrator()), port=0),  # no profiler attribute
+        make_server(AnalysisService(orchestrator=Orchestrator(profiler=Profiler(output_dir=str(tmp_path)))), port=0),
+    ]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        status, body = _get(servers[0], "/profiling/report")
+        assert status == 500 and "profiler" in body["error"]
+        assert _get(servers[1], "/profiling/report") == (200, {"run_dir": None})
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+def test_run_batch_quarantines_fetch_errors_and_run_applies_quality_gate():
+    from src.tools.load_generator import SyntheticAPIFetcher, SyntheticMarket
+
+    market = SyntheticMarket(n_tickers=20, years=1, seed=3)
+    fetcher = SyntheticAPIFetcher(market, error_rate=0.05, seed=3)
+    orchestrator = Orchestrator(fetcher=fetcher, profiler=Profiler())
+    out = orchestrator.run_batch({t: {} for t in market.tickers}, as_of="2025-08-08")
+    failed = [t for t, found in out["quarantined"].items() if found == ["fetch_error"]]
+    assert failed
+    assert len(out["results"]) + len(out["quarantined"]) == 20
+
+    dates = ["2025-08-04", "2025-08-05", "2025-08-06"]
+    bad = orchestrator.run({"ticker": "BAD", "as_of": "2025-08-06", "technicals": {"dates": dates, "close": [10.0, None, 10.2]}})
+    assert bad == {"ticker": "BAD", "as_of": "2025-08-06", "quarantined": ["missing_bars"]}
+
+
+def test_profiler_keeps_caller_tickers_out_of_paths(tmp_path):
+    profiler = Profiler(output_dir=str(tmp_path / "out"), sample_rate=1.0)
+    orchestrator = Orchestrator(profiler=profiler)
+    for ticker in ("BF/B", "../../ESCAPE"):
+        assert orchestrator.run({"ticker": ticker, "as_of": "2025-08-06"})["ticker"] == ticker
+    run_dir = profiler.run_dir
+    assert [r["ticker"] for r in profiler.records] == ["BF/B", "../../ESCAPE"]
+    assert all(os.path.dirname(r["profile"]) == run_dir for r in profiler.records)
+    assert sorted(os.listdir(tmp_path)) == ["out"]
+
+    (tmp_path / "blocked").write_text("")  # output_dir is a file: traces cannot be written
+    profiler = Profiler(output_dir=str(tmp_path / "blocked"), sample_rate=1.0)
+    assert Orchestrator(profiler=profiler).run({"ticker": "AAA", "as_of": "2025-08-06"})["ticker"] == "AAA"
+    assert profiler.records[0]["profile"] is None
+
+
+def test_profiled_batch_leaves_concurrent_records_alone(tmp_path):
+    profiler = Profiler(output_dir=str(tmp_path), sample_rate=1.0)
+    orchestrator = Orchestrator(profiler=profiler)
+    orchestrator.run({"ticker": "SVC", "as_of": "2025-08-06"})
+    orchestrator.run_batch({"AAA": {}})
+    assert [r["ticker"] for r in profiler.records] == ["SVC"]
+    reports = list(tmp_path.glob("*/tickers.json"))
+    assert len(reports) == 1  # only the batch run was reported
+    tickers = {r["ticker"] for r in json.loads(reports[0].read_text())}
+    assert tickers == {"__batch__", "AAA"}
+
+
+def test_profiler_flushes_default_run_at_max_records(tmp_path):
+    profiler = Profiler(output_dir=str(tmp_path), sample_rate=1.0, max_records=3)
+    for i in range(7):
+        with profiler.session(f"T{i}"):
+            pass
+    assert len(list(tmp_path.glob("*/tickers.json"))) == 2
+    assert [r["ticker"] for r in profiler.records] == ["T6"]
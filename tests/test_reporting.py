@@ -3,7 +3,76 @@ Unit tests for Reporting module.
 """
 import pytest
 from src.reporting.reporter import Reporter
+from src.reporting.artifacts import ArtifactJob, ArtifactRenderer
+from src.types import Decision
 
 def test_reporter():
     reporter = Reporter()
     assert reporter.report(None) is None
+
+
+def _jobs(close):
+    dates = [f"2025-08-{d:02d}" for d in range(1, len(close) + 1)]
+    return [
+        ArtifactJob("AAA", "price_chart", "price_chart", {"dates": dates, "close": close, "ma_windows": [3]}),
+        ArtifactJob(
+            "AAA",
+            "valuation_heatmap",
+            "valuation_heatmap",
+            {"rows": ["8%", "9%"], "cols": ["1%", "2%"], "values": [[110.0, 120.0], [100.0, 108.0]]},
+        ),
+    ]
+
+
+def test_artifact_renderer_caches_by_content(tmp_path):
+    renderer = ArtifactRenderer(str(tmp_path), max_workers=2)
+    refs = renderer.render_many(_jobs([10.0, 11.0, 10.5, 12.0]))
+    chart = refs["AAA"]["price_chart"]
+    assert chart["content_type"] == "image/svg+xml"
+    with open(chart["path"], encoding="utf-8") as fh:
+        assert fh.read().startswith("<svg")
+    assert (renderer.hits, renderer.misses) == (0, 2)
+
+    # Same inputs reuse the cached files; changed prices re-render only the chart.
+    assert renderer.render_many(_jobs([10.0, 11.0, 10.5, 12.0])) == refs
+    assert renderer.hits == 2
+    changed = renderer.render_many(_jobs([10.0, 11.0, 10.5, 12.5]))
+    assert changed["AAA"]["price_chart"]["path"] != chart["path"]
+    assert changed["AAA"]["valuation_heatmap"] == refs["AAA"]["valuation_heatmap"]
+    assert (renderer.hits, renderer.misses) == (3, 3)
+
+
+def test_artifact_renderer_attach_keeps_references_small():
+    decision = Decision(
+        as_of="2025-08-08",
+        ticker="AAA",
+        recommendation="HOLD",
+        target_price_12m=10.0,
+        expected_total_return_pct=0.0,
+        risk_rating="Medium",
+        thesis=["t1", "t2"],
+        key_risks=["r1", "r2"],
+        valuation={"blended": 10.0},
+        scenarios={"base": {"prob": 1.0, "fair_value": 10.0}},
+        technicals={"trend": "Sideways", "ma_cross": "none", "rsi_14": 50.0, "levels": {}},
+        sentiment={"analyst_consensus": "Hold"},
+    )
+    ref = {"path": "/cache/ab/abc.svg", "sha256": "abc", "content_type": "image/svg+xml"}
+    out = ArtifactRenderer.attach(decision, {"price_chart": ref})
+    assert out.artifacts == {"price_chart": ref}
+    assert decision.artifacts is None
+
+
+def test_artifact_renderer_isolates_failed_jobs(tmp_path):
+    renderer = ArtifactRenderer(str(tmp_path), max_workers=2)
+    heatmap = {"rows": ["2%", "3%"], "cols": ["2%", "3%"], "values": [[None, 90.0], [120.0, None]]}
+    refs = renderer.render_many(
+        [
+            ArtifactJob("AAA", "valuation_heatmap", "valuation_heatmap", heatmap),
+            ArtifactJob("AAA", "price_chart", "price_chart", {"close": [1.0, 2.0], "ma_windows": [0]}),
+        ]
+    )
+    assert list(refs["AAA"]) == ["valuation_heatmap"]
+    with open(refs["AAA"]["valuation_heatmap"]["path"], encoding="utf-8") as fh:
+        assert 'fill="#cccccc"' in fh.read()
+    assert "window must be >= 1" in renderer.failures[("AAA", "price_chart")]
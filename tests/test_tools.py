@@ -4,6 +4,16 @@ Unit tests for Tools modules.
 import pytest
 from src.tools.api_fetcher import APIFetcher
 from src.tools.validator import Validator
+from src.tools.decision_store import DecisionStore, RecommendationChange
+from src.tools.load_generator import (
+    LoadDriver,
+    SyntheticAPIFetcher,
+    SyntheticFetchError,
+    SyntheticMarket,
+    percentile,
+)
+from src.orchestrator.orchestrator import Orchestrator
+from src.types import Decision
 
 def test_api_fetcher():
     fetcher = APIFetcher()
@@ -12,3 +22,190 @@ def test_api_fetcher():
 def test_validator():
     validator = Validator()
     assert validator.validate(None) is None or validator.validate(None) is False
+
+
+def _decision(ticker, as_of, recommendation="BUY", risk_rating="Low", target=110.0, expected=20.0):
+    return Decision(
+        as_of=as_of,
+        ticker=ticker,
+        recommendation=recommendation,
+        target_price_12m=target,
+        expected_total_return_pct=expected,
+        risk_rating=risk_rating,
+        thesis=["t1", "t2"],
+        key_risks=["r1", "r2"],
+        valuation={"blended": target},
+        scenarios={"base": {"prob": 1.0, "fair_value": target}},
+        technicals={"trend": "Up", "ma_cross": "none", "rsi_14": 50.0, "levels": {}},
+        sentiment={"analyst_consensus": "Hold"},
+    )
+
+
+def test_decision_store_query_and_diff():
+    store = DecisionStore()
+    store.put_many(
+        [
+            _decision("AAA", "2025-08-04", "HOLD"),
+            _decision("BBB", "2025-08-04", "BUY"),
+            _decision("AAA", "2025-08-08", "BUY", expected=18.0),
+            _decision("BBB", "2025-08-08", "BUY", risk_rating="High", expected=30.0),
+            _decision("CCC", "2025-08-08", "BUY", expected=10.0),
+        ],
+        sectors={"AAA": "Technology", "BBB": "Energy"},
+    )
+    assert len(store) == 5
+
+    hits = store.query(as_of="2025-08-08", recommendation="BUY", risk_rating="Low", expected_total_return_pct=(15.0, None))
+    assert [d.ticker for d in hits] == ["AAA"]
+    assert store.keys(sector="Energy") == [("BBB", "2025-08-04"), ("BBB", "2025-08-08")]
+    assert store.get("CCC", "2025-08-08").expected_total_return_pct == 10.0
+    assert store.get("CCC", "2025-08-04") is None
+
+    assert store.diff("2025-08-04", "2025-08-08") == [RecommendationChange("AAA", "HOLD", "BUY")]
+
+    # Re-storing the same (ticker, as_of) replaces the prior row.
+    store.put(_decision("AAA", "2025-08-08", "SELL"), sector="Technology")
+    assert len(store) == 5
+    assert store.diff("2025-08-04", "2025-08-08")[0].new == "SELL"
+
+
+def test_validator_schema_check():
+    validator = Validator()
+    assert validator.validate(_decision("AAA", "2025-08-08")) is True
+    assert validator.validate({"ticker": "AAA"}) is False
+
+
+def test_validator_quality_mask():
+    dates = ["2025-08-04", "2025-08-05", "2025-08-06", "2025-08-07", "2025-08-08"]
+    week = dates + ["2025-08-11"]
+    universe = {
+        "GOOD": {"technicals": {"dates": dates, "close": [10.0, 10.1, 10.2, 10.1, 10.3]}},
+        "GAP": {"technicals": {"dates": dates[:2] + ["2025-08-20"], "close": [10.0, 10.1, 10.2]}},
+        "STALE": {"technicals": {"dates": dates, "close": [10.0] * 5}},
+        "SPLIT": {"technicals": {"dates": week, "close": [100.0, 101.0, 50.4, 50.5, 50.6, 50.2]}},
+        "CRASH": {"technicals": {"dates": week, "close": [100.0, 101.0, 50.5, 60.0, 66.0, 70.0]}},
+        "OUTLIER": {"technicals": {"dates": dates, "close": [10.0, 10.1, 17.0, 10.2, 10.3]}},
+        "UNORDERED": {"technicals": {"dates": [dates[1], dates[0]], "close": [10.0, 10.1]}},
+        "NEGREV": {"fundamentals": {"revenue_history": [100.0, -5.0]}},
+    }
+    issues = Validator().check_quality(universe)
+    assert issues["GOOD"] == []
+    assert issues["GAP"] == ["missing_bars"]
+    assert issues["STALE"] == ["stale_prices"]
+    assert issues["SPLIT"] == ["unadjusted_split"]
+    # A real -50% crash that keeps moving afterwards is an outlier, not a split.
+    assert issues["CRASH"] == ["outlier_return"]
+    assert issues["OUTLIER"] == ["outlier_return"]
+    assert issues["UNORDERED"] == ["non_monotonic_dates"]
+    assert issues["NEGREV"] == ["negative_revenue"]
+    mask = Validator().quality_mask(universe)
+    assert [t for t, ok in mask.items() if ok] == ["GOOD"]
+
+
+def test_synthetic_market_is_deterministic():
+    a = SyntheticMarket(n_tickers=3, years=1, seed=7)
+    b = SyntheticMarket(n_tickers=3, years=1, seed=7)
+    for endpoint in SyntheticMarket.ENDPOINTS:
+        assert a.fetch(endpoint, "T00001") == b.fetch(endpoint, "T00001")
+    prices = a.fetch("prices", "T00001")
+    assert len(prices["dates"]) == len(prices["close"]) > 250
+    assert SyntheticMarket(n_tickers=3, years=1, seed=8).fetch("prices", "T00001") != prices
+
+
+def test_synthetic_fetcher_injects_errors():
+    market = SyntheticMarket(n_tickers=1, years=1)
+    with pytest.raises(SyntheticFetchError):
+        SyntheticAPIFetcher(market, error_rate=1.0).fetch("prices", {"ticker": "T00000"})
+
+
+def test_synthetic_fetcher_failures_are_order_independent():
+    market = SyntheticMarket(n_tickers=50, years=1, seed=4)
+    calls = [(endpoint, t) for t in market.tickers for endpoint in ("prices", "fundamentals", "news", "macro")]
+
+    def failures(order):
+        fetcher = SyntheticAPIFetcher(market, error_rate=0.1, seed=4)
+        failed = set()
+        for endpoint, ticker in order:
+            try:
+                fetcher.fetch(endpoint, {"ticker": ticker})
+            except SyntheticFetchError:
+                failed.add((endpoint, ticker))
+        return failed
+
+    assert failures(calls) == failures(list(reversed(calls)))
+    assert failures(calls)
+
+
+def test_load_driver_report():
+    market = SyntheticMarket(n_tickers=20, years=2, seed=2)
+    reports = [
+        LoadDriver(Orchestrator(fetcher=SyntheticAPIFetcher(market, error_rate=0.05, seed=2)), workers=8).run(
+            market.tickers, as_of="2025-08-08"
+        )
+        for _ in range(2)
+    ]
+    report = reports[0]
+    assert report["tickers"] == 20
+    assert 0 < report["errors"] < 20
+    assert reports[1]["errors"] == report["errors"]  # failures do not depend on thread scheduling
+    assert report["stages"]["total"]["count"] == 20
+    assert report["stages"]["fetch:prices"]["p50_ms"] >= 0
+    assert percentile([1, 2, 3, 4], 50) == 2
+
+
+def test_decision_store_rejects_bad_filters():
+    store = DecisionStore()
+    store.put(_decision("AAA", "2025-08-08"))
+    with pytest.raises(TypeError):
+        store.keys(recomendation="BUY")
+    with pytest.raises(ValueError):
+        store.keys(target_price_12m=5.0)
+    with pytest.raises(ValueError):
+        store.query(expected_total_return_pct=(1.0, 2.0, 3.0))
+    assert store.keys(target_price_12m=(100.0, None)) == [("AAA", "2025-08-08")]
+
+
+def test_decision_store_range_queries_use_range_indexes():
+    store = DecisionStore()
+    store.put_many([
+        _decision("AAA", "2025-08-08", expected=20.0, target=120.0),
+        _decision("BBB", "2025-08-08", expected=35.0, target=90.0),
+        _decision("AAA", "2025-08-04", expected=40.0, target=130.0),
+    ])
+
+    def plan(**filters):
+        sql, params = store._build_select("ticker, as_of", filters, None, "as_of")
+        return " ".join(r[-1] for r in store._conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+    assert "idx_decisions_expected_return" in plan(expected_total_return_pct=(30.0, None))
+    assert "idx_decisions_as_of_expected_return" in plan(as_of="2025-08-08", expected_total_return_pct=(30.0, None))
+    assert "idx_decisions_sector_target_price" in plan(sector="Energy", target_price_12m=(100.0, None))
+
+    assert store.keys(expected_total_return_pct=(30.0, None)) == [("AAA", "2025-08-04"), ("BBB", "2025-08-08")]
+    assert store.keys(target_price_12m=(0.0, None), order_by="target_price_12m")[0] == ("BBB", "2025-08-08")
+    assert sorted(store.keys(order_by=None)) == [("AAA", "2025-08-04"), ("AAA", "2025-08-08"), ("BBB", "2025-08-08")]
+    with pytest.raises(ValueError):
+        store.keys(order_by="payload")
+
+
+def test_validator_quality_coerces_malformed_inputs():
+    dates = ["2025-08-04", "2025-08-05", "2025-08-06"]
+    universe = {
+        "NAN": {"technicals": {"dates": dates, "close": [10.0, float("nan"), 10.2]}},
+        "NONE": {"technicals": {"dates": dates, "close": [10.0, None, 10.2]}},
+        "NUMSTR": {"technicals": {"dates": dates, "close": ["10.0", "10.1", "10.2"]}},
+        "TEXT": {"technicals": {"dates": dates, "close": [10.0, "n/a", 10.2]}},
+        "BADDATE": {"technicals": {"dates": [dates[0], None, dates[2]], "close": [10.0, 10.1, 10.2]}},
+        "MISMATCH": {"technicals": {"dates": dates[:2], "close": [10.0, 10.1, 10.2]}},
+        "REVTEXT": {"fundamentals": {"revenue_history": [100.0, "unknown"]}},
+        "REVNAN": {"fundamentals": {"revenue_history": [100.0, float("nan"), 90.0]}},
+    }
+    issues = Validator().check_quality(universe)
+    assert issues["NAN"] == ["missing_bars"]
+    assert issues["NONE"] == ["missing_bars"]
+    assert issues["NUMSTR"] == []
+    assert issues["TEXT"] == ["bad_closes"]
+    assert issues["BADDATE"] == ["bad_dates"]
+    assert issues["MISMATCH"] == ["length_mismatch"]
+    assert issues["REVTEXT"] == ["bad_revenue"]
+    assert issues["REVNAN"] == []